@@ -1,13 +1,15 @@
 from decimal import Decimal, ROUND_HALF_UP, getcontext
+from operator import mul
 from typing import cast
 
 # local import to avoid circular dependency in small package
-from model import Recipe
+from model import IngredientTable, Recipe
 
 # reasonable precision for recipe cost calculations
 getcontext().prec = 28
 
 MONEY_QUANT = Decimal("0.01")
+ZERO = Decimal(0)
 
 
 def _quantize_money(d: Decimal) -> Decimal:
@@ -16,14 +18,24 @@ def _quantize_money(d: Decimal) -> Decimal:
 
 def calculate_total_cost(recipe: Recipe) -> Decimal:
     """Return total cost (Decimal) rounded to 2 decimal places."""
-    total = Decimal("0")
-    for ing in recipe.ingredients:
-        q = Decimal(ing.quantity)
-        p = Decimal(ing.price_per_unit)
-        total += q * p
+    # Ingredient.__post_init__ already stores quantity/price_per_unit as Decimal
+    total = sum((ing.quantity * ing.price_per_unit for ing in recipe.ingredients), ZERO)
     return _quantize_money(total)
 
 
+def calculate_table_cost(table: IngredientTable) -> Decimal:
+    """Return the total cost of an IngredientTable, rounded to 2 decimal places.
+
+    The sweep runs on the float columns; only the result becomes a Decimal.
+    Float rounding can leave the total a cent away from the exact Decimal
+    sum of ``calculate_total_cost``, so use this only where speed matters
+    more than exact cents.
+    """
+    total = sum(map(mul, table.qty, table.ppu), 0.0)
+    # repr() gives the shortest round-tripping digits, so e.g. 0.575 rounds up
+    return _quantize_money(Decimal(repr(total)))
+
+
 def calculate_cost_per_serving(recipe: Recipe) -> Decimal:
     """Return cost per serving (Decimal, rounded). Raises ValueError for invalid servings."""
     if recipe.servings <= 0:
@@ -0,0 +1,68 @@
+"""Bulk cost totals for many recipes at once (e.g. a whole menu).
+
+The recipes are flattened into contiguous float64 ``qty``/``ppu`` arrays once
+per batch and summed per recipe in a single pass. numpy is required for the
+array path and numba, when installed, compiles the summing kernel; without
+numpy every recipe goes through the Decimal path in ``calc``.
+"""
+from decimal import Decimal
+from typing import List, Tuple
+
+from calc import _quantize_money, calculate_total_cost
+from model import Recipe
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _sum_costs(qty, ppu, offsets, out):
+    # recipe i owns the slice offsets[i]:offsets[i + 1] of qty/ppu
+    for i in range(out.shape[0]):
+        total = 0.0
+        for j in range(offsets[i], offsets[i + 1]):
+            total += qty[j] * ppu[j]
+        out[i] = total
+
+
+if numba is not None:
+    _sum_costs = numba.njit(cache=True, fastmath=True)(_sum_costs)
+
+
+def flatten_recipes(recipes: List[Recipe]) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Return ``(qty, ppu, offsets)`` float64/int64 arrays for *recipes*."""
+    counts = [len(r.ingredients) for r in recipes]
+    offsets = np.zeros(len(recipes) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    qty = np.fromiter((float(i.quantity) for r in recipes for i in r.ingredients),
+                      dtype=np.float64, count=int(offsets[-1]))
+    ppu = np.fromiter((float(i.price_per_unit) for r in recipes for i in r.ingredients),
+                      dtype=np.float64, count=int(offsets[-1]))
+    return qty, ppu, offsets
+
+
+def calculate_total_cost_bulk(recipes: List[Recipe]) -> List[Decimal]:
+    """Return the total cost of each recipe, rounded to 2 decimal places.
+
+    With numpy the totals are summed in float64, like
+    ``calc.calculate_table_cost``, and can come out a cent away from the
+    exact ``calc.calculate_total_cost`` of the same recipe; use that where
+    exact cents matter.
+    """
+    if np is None:
+        return [calculate_total_cost(r) for r in recipes]
+    qty, ppu, offsets = flatten_recipes(recipes)
+    if numba is not None:
+        totals = np.empty(len(recipes), dtype=np.float64)
+        _sum_costs(qty, ppu, offsets, totals)
+    else:
+        # one vectorised multiply, then a per-recipe segmented sum
+        owner = np.repeat(np.arange(len(recipes)), np.diff(offsets))
+        totals = np.bincount(owner, weights=qty * ppu, minlength=len(recipes))
+    return [_quantize_money(Decimal(repr(float(t)))) for t in totals]
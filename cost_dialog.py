@@ -1,8 +1,9 @@
-from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import functools
+from decimal import Decimal
 from typing import Optional
 
-from PySide6.QtCore import Qt, QPoint, QEvent
-from PySide6.QtGui import QDoubleValidator
+from PySide6.QtCore import Qt, QEvent, QTimer
+from PySide6.QtGui import QDoubleValidator, QValidator
 from PySide6.QtWidgets import (
     QDialog,
     QHBoxLayout,
@@ -16,19 +17,65 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
     QHeaderView,
-    QApplication,
-    QAbstractItemDelegate,
 )
 
 from model import Ingredient, Recipe
 from calc import calculate_total_cost, calculate_cost_per_serving
 
 
+# live PPU maths is done on ints scaled by SCALE (micro-units); Decimal is
+# only used when handing values to the model in get_recipe
+SCALE = 1_000_000
+_SCALE_D = Decimal(SCALE)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_micro(text: str) -> int:
+    """Parse a numeric string into an int scaled by ``SCALE``.
+
+    Raises ValueError for text that is not a finite number.  Results are
+    cached: the same short strings recur across keystrokes and rows.
+    """
+    try:
+        return int(round(float(text) * SCALE))
+    except OverflowError:
+        raise ValueError(f"Invalid numeric value: {text}")
+
+
+def format_money(micro: int, scale: int = SCALE) -> str:
+    """Format a micro-unit int with two decimals, rounding half up.
+
+    Pass ``scale=SCALE * SCALE`` for the product of two micro-unit values.
+    """
+    sign = "-" if micro < 0 else ""
+    cents = (abs(micro) + scale // 200) // (scale // 100)
+    return f"{sign}{cents // 100}.{cents % 100:02d}"
+
+
+class CapitalFirstValidator(QValidator):
+    """Accept any text, upper-casing its first character in place.
+
+    QLineEdit applies the adjusted text itself before emitting textChanged,
+    so names are capitalised as typed without a Python slot per keystroke.
+    """
+
+    def validate(self, text: str, pos: int):
+        if text:
+            text = text[:1].upper() + text[1:]
+        return QValidator.Acceptable, text, pos
+
 
 class CocktailCostDialog(QDialog):
     """Modal dialog to collect a recipe and compute costs.
 
     Minimal, testable implementation using QTableWidget for ingredient rows.
+    Parsed row values live in ``self._rows`` so edits only recompute their
+    own row and ``get_recipe`` reads plain Python data.
+
+    Cells are deliberately persistent QLineEdits rather than a QTableView with
+    delegate editors: Enter navigation, live PPU updates while typing and the
+    tests all address the editor widgets directly (``table.cellWidget``).
+    The cost that matters — parsing and recomputing — is kept off the widgets.
     """
 
     COL_NAME = 0
@@ -37,19 +84,50 @@ class CocktailCostDialog(QDialog):
     COL_UNIT = 3
     COL_PRICE_PER_UNIT = 4   # price per unit (editable)
 
+    # row store key for each column, indexed by COL_*
+    _ROW_KEYS = ("name", "row_price", "qty", "unit", "ppu")
+    # editor objectName prefix for each column, indexed by COL_*
+    _OBJECT_NAMES = ("name", "row-price", "qty", "unit", "price")
+    # columns whose edits feed the price-per-unit computation
+    _PPU_TRIGGER_COLS = frozenset({COL_QTY, COL_UNIT, COL_ROW_PRICE})
+
+    # quiet period after the last keystroke before PPU is recomputed
+    PPU_DEBOUNCE_MS = 40
+
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self.setWindowTitle("Cocktail Cost Calculator")
+        # parsed values for each table row, kept in step with the cell widgets
+        # so recalculation and get_recipe never have to re-read/parse the UI
+        self._rows: list[dict] = []
+        # the five QLineEdits of each row, indexed by COL_*, so hot paths avoid
+        # QTableWidget.cellWidget lookups
+        self._row_widgets: list[list[QLineEdit]] = []
+        # reverse lookup of a cell widget's (row, column), renumbered on removal
+        self._widget_pos: dict[QLineEdit, tuple[int, int]] = {}
+        # running total of every row's PPU (micro-units), adjusted by each edit's delta
+        self._ppu_sum_micro = 0
+        # rows whose PPU must be recomputed once typing pauses
+        self._update_pending = False
+        self._pending_rows: set[int] = set()
+        self._ppu_timer = QTimer(self)
+        self._ppu_timer.setSingleShot(True)
+        self._ppu_timer.setInterval(self.PPU_DEBOUNCE_MS)
+        self._ppu_timer.timeout.connect(self._do_recompute_ppu)
+        # validators hold no per-cell state, so every row shares these
+        self._name_validator = CapitalFirstValidator(self)
+        self._num_validator = QDoubleValidator(0.0, 1e9, 6, self)
         self._build_ui()
 
     def _build_ui(self) -> None:
-        layout = QVBoxLayout()
+        # parented up front so the dialog is not re-laid out by a later setLayout
+        layout = QVBoxLayout(self)
         # cocktail name
         hl_top = QHBoxLayout()
         hl_top.addWidget(QLabel("Cocktail name:"))
         self.name_edit = QLineEdit()
         # auto-capitalize first letter of cocktail name
-        self.name_edit.textChanged.connect(lambda _t, w=self.name_edit: self._capitalize_first(w))
+        self.name_edit.setValidator(CapitalFirstValidator(self.name_edit))
         hl_top.addWidget(self.name_edit)
         layout.addLayout(hl_top)
 
@@ -91,8 +169,6 @@ class CocktailCostDialog(QDialog):
         br = QHBoxLayout()
         br.addStretch()
         self.ok_btn = QPushButton("OK")
-        # commit edits when OK is pressed as well
-        self.ok_btn.pressed.connect(self._commit_table_editors)
         self.ok_btn.clicked.connect(self.accept)
         br.addWidget(self.ok_btn)
         self.cancel_btn = QPushButton("Cancel")
@@ -100,8 +176,6 @@ class CocktailCostDialog(QDialog):
         br.addWidget(self.cancel_btn)
         layout.addLayout(br)
 
-        self.setLayout(layout)
-
         # make window larger so additional table columns are visible
         # and ensure the table has enough minimum width for more columns
         self.resize(900, 520)
@@ -130,134 +204,23 @@ class CocktailCostDialog(QDialog):
         column we set ``copy_ppu`` to False so that the value is only momentary
         until the user types something.
         """
-        row = self.table.rowCount()
-
-        # capture active editor text for the previous row's Price (£) cell if present
-        active_editor_row_price_text = None
-        if row > 0:
-            fw = self.table.focusWidget() or QApplication.focusWidget()
-            if isinstance(fw, QLineEdit):
-                try:
-                    idx = self.table.indexAt(fw.mapTo(self.table.viewport(), QPoint(0, 0)))
-                    if idx.isValid() and idx.row() == row - 1 and idx.column() == self.COL_ROW_PRICE:
-                        active_editor_row_price_text = fw.text().strip()
-                except Exception:
-                    active_editor_row_price_text = None
-
-                # fallback: if the current table item is the Price cell for previous
-                # row, use the focused editor's text directly (more robust in tests)
-                if active_editor_row_price_text is None:
-                    curr = self.table.currentItem()
-                    if curr is not None and curr.row() == row - 1 and curr.column() == self.COL_ROW_PRICE:
-                        try:
-                            active_editor_row_price_text = fw.text().strip()
-                        except Exception:
-                            active_editor_row_price_text = None
-        # expose the last active-editor text for diagnostics/tests
+        self.table.setUpdatesEnabled(False)
         try:
-            self._last_active_editor_text = active_editor_row_price_text
-        except Exception:
-            self._last_active_editor_text = None
-
-        # prepare default price per unit for the new row if none provided
-        if copy_ppu and row > 0 and not price:
-            # commit any active editor so that uncommitted text is not lost
-            self._commit_table_editors()
-
-            # attempt to compute ppu from the previous row's entered price
-            ppu_copy = None
-            try:
-                # check for an active editor value first (previous row's Price £)
-                rp_text = None
-                if active_editor_row_price_text:
-                    rp_text = active_editor_row_price_text
-                else:
-                    prev_price_w = self.table.cellWidget(row - 1, self.COL_ROW_PRICE)
-                    if prev_price_w is not None:
-                        rp_text = prev_price_w.text().strip()
-                if rp_text:
-                    rp = Decimal(rp_text)
-                    qty_w = self.table.cellWidget(row - 1, self.COL_QTY)
-                    unit_w = self.table.cellWidget(row - 1, self.COL_UNIT)
-                    qty_val = Decimal(qty_w.text() or "0")
-                    unit_spec_val = Decimal(unit_w.text() or "0")
-                    if qty_val > 0 and unit_spec_val > 0:
-                        ppu_copy = (rp * (unit_spec_val / qty_val)).quantize(Decimal("0.000001"))
-                        # also update the displayed PPU in the previous row immediately
-                        try:
-                            prev_ppu_w = self.table.cellWidget(row - 1, self.COL_PRICE_PER_UNIT)
-                            if prev_ppu_w is not None:
-                                prev_ppu_w.setText(self._format_ppu(ppu_copy))
-                        except Exception:
-                            pass
-            except Exception:
-                ppu_copy = None
-
-            if ppu_copy is not None:
-                price = format(ppu_copy.normalize(), 'f')
-            else:
-                # fallback: if previous PPU widget already had a value, copy it
-                prev_ppu_w = self.table.cellWidget(row - 1, self.COL_PRICE_PER_UNIT)
-                if prev_ppu_w and prev_ppu_w.text().strip():
-                    price = prev_ppu_w.text()
-
-        self.table.insertRow(row)
-
-        name_edit = QLineEdit(name)
-        name_edit.setObjectName(f"name-{row}")
-        # auto-capitalize ingredient name
-        name_edit.textChanged.connect(lambda _t, w=name_edit: self._capitalize_first(w))
-        # pressing Enter jumps to next logical field
-        name_edit.returnPressed.connect(lambda r=row, c=self.COL_NAME: self._focus_next(r, c))
-        name_edit.installEventFilter(self)
-        self.table.setCellWidget(row, self.COL_NAME, name_edit)
-        row_price_edit = QLineEdit("")
-        row_price_edit.setObjectName(f"row-price-{row}")
-        row_price_edit.setValidator(QDoubleValidator(0.0, 1e9, 6))
-        row_price_edit.returnPressed.connect(lambda r=row, c=self.COL_ROW_PRICE: self._focus_next(r, c))
-        row_price_edit.installEventFilter(self)
-        self.table.setCellWidget(row, self.COL_ROW_PRICE, row_price_edit)
-        qty_edit = QLineEdit(qty)
-        qty_edit.setObjectName(f"qty-{row}")
-        # allow decimal input
-        qty_edit.setValidator(QDoubleValidator(0.0, 1e9, 6))
-        qty_edit.returnPressed.connect(lambda r=row, c=self.COL_QTY: self._focus_next(r, c))
-        qty_edit.installEventFilter(self)
-        self.table.setCellWidget(row, self.COL_QTY, qty_edit)
-        unit_edit = QLineEdit(unit)
-        unit_edit.setObjectName(f"unit-{row}")
-        unit_edit.setValidator(QDoubleValidator(0.0, 1e9, 6))
-        unit_edit.returnPressed.connect(lambda r=row, c=self.COL_UNIT: self._focus_next(r, c))
-        unit_edit.installEventFilter(self)
-        self.table.setCellWidget(row, self.COL_UNIT, unit_edit)
-
-        # Price per unit (read-only, may be auto-filled or copied)
-        price_edit = QLineEdit(price)
-        price_edit.setObjectName(f"price-{row}")
-        price_edit.setValidator(QDoubleValidator(0.0, 1e9, 6))
-        price_edit.setReadOnly(True)
-        # users should not be able to edit or even focus this column
-        price_edit.setFocusPolicy(Qt.NoFocus)
-        price_edit.installEventFilter(self)
-        self.table.setCellWidget(row, self.COL_PRICE_PER_UNIT, price_edit)
-
-        # connect edits to auto-update Price / unit when relevant fields change
-        row_price_edit.textChanged.connect(self._update_all_price_per_unit)
-        row_price_edit.editingFinished.connect(self._update_all_price_per_unit)
-        qty_edit.textChanged.connect(self._update_all_price_per_unit)
-        qty_edit.editingFinished.connect(self._update_all_price_per_unit)
-        unit_edit.textChanged.connect(self._update_all_price_per_unit)
-        unit_edit.editingFinished.connect(self._update_all_price_per_unit)
-        price_edit.textChanged.connect(lambda _text, r=row: (self._on_price_per_unit_edited(r), self._update_ppu_sum()))
+            name_edit = self._add_row_nopaint(name, qty, unit, price, copy_ppu=copy_ppu)
+        finally:
+            self.table.setUpdatesEnabled(True)
+        row = self.table.rowCount() - 1
 
         # make the new row visible and focus the Ingredient Name so typing starts immediately
         self.table.setCurrentCell(row, self.COL_NAME)
-        # bring the dialog to the front and focus the name editor so typing starts immediately
+        # bring the dialog to the front and focus the name editor so typing starts immediately.
+        # Events are not pumped here (that would force pending repaints per row);
+        # callers needing the focus change delivered synchronously should call
+        # QApplication.processEvents() after add_row.
         try:
             self.activateWindow()
             self.raise_()
             name_edit.setFocus(Qt.TabFocusReason)
-            QApplication.processEvents()
         except Exception:
             # best-effort — ignore if running headless or focus cannot be set
             name_edit.setFocus()
@@ -267,29 +230,183 @@ class CocktailCostDialog(QDialog):
         # recalc PPU sum in case a value was copied into the new row
         self._update_ppu_sum()
 
+    def add_rows(self, specs: list[dict]) -> None:
+        """Append several ingredient rows in one go.
+
+        Each spec holds ``add_row`` keyword arguments.  Table repaints are
+        suspended while the rows are built and the PPU updates are flushed
+        once at the end, so a bulk insert lays the table out only once.
+        """
+        if not specs:
+            return
+        self.table.setUpdatesEnabled(False)
+        # hold back per-row refreshes; the flush below handles every new row
+        self._update_pending = True
+        try:
+            for spec in specs:
+                self._add_row_nopaint(**spec)
+        finally:
+            self.table.setUpdatesEnabled(True)
+            self.table.scrollToBottom()
+            # also runs if a spec raised, so the pending flag is never left set
+            self._do_recompute_ppu()
+
+    def populate_row(
+        self,
+        row: int,
+        *,
+        name: Optional[str] = None,
+        qty: Optional[str] = None,
+        unit: Optional[str] = None,
+        price: Optional[str] = None,
+        ppu: Optional[str] = None,
+    ) -> None:
+        """Set several fields of an existing row in one go.
+
+        ``price`` is the row price and ``ppu`` the price per unit; fields left
+        as None are not touched.  The editors' signals are blocked while their
+        text is set, the row store is updated directly and a single PPU
+        recompute is scheduled for the row.
+        """
+        values = self._rows[row]
+        widgets = self._row_widgets[row]
+        for col, text in (
+            (self.COL_NAME, name),
+            (self.COL_ROW_PRICE, price),
+            (self.COL_QTY, qty),
+            (self.COL_UNIT, unit),
+            (self.COL_PRICE_PER_UNIT, ppu),
+        ):
+            if text is None:
+                continue
+            w = widgets[col]
+            w.blockSignals(True)
+            try:
+                w.setText(text)
+            finally:
+                w.blockSignals(False)
+            # read back so validator fix-ups (name capitalisation) are stored
+            self._store_value(values, self._ROW_KEYS[col], w.text())
+        self._schedule_recompute(row)
+
+    def _add_row_nopaint(self, name: str = "", qty: str = "", unit: str = "", price: str = "", *, copy_ppu: bool = True) -> QLineEdit:
+        """Build the widgets and stored values for a new last row.
+
+        Focus, scrolling and the PPU sum label are left to the caller.
+        Returns the row's name editor.
+        """
+        row = self.table.rowCount()
+
+        # prepare default price per unit for the new row if none provided
+        if copy_ppu and row > 0 and not price:
+            # a recompute still queued for the previous row may change (or
+            # clear) its PPU, so apply it before anything is copied
+            if row - 1 in self._pending_rows:
+                self._pending_rows.discard(row - 1)
+                self._update_price_per_unit_for_row(row - 1)
+            # compute ppu from the previous row's entered price when possible
+            prev_ppu_w = self._row_widgets[row - 1][self.COL_PRICE_PER_UNIT]
+            ppu_copy = self._compute_ppu_micro(self._rows[row - 1])
+            if ppu_copy is not None:
+                # also update the displayed PPU in the previous row immediately
+                prev_ppu_w.setText(format_money(ppu_copy))
+                price = format((Decimal(ppu_copy) / _SCALE_D).normalize(), 'f')
+            elif prev_ppu_w.text().strip():
+                # fallback: if previous PPU widget already had a value, copy it
+                price = prev_ppu_w.text()
+
+        # editors are created on the viewport, the parent setCellWidget would
+        # otherwise move them to; they are built before the row is inserted so
+        # a bad value (e.g. a non-str qty) leaves table and store in step
+        viewport = self.table.viewport()
+        widgets = []
+        try:
+            for col, text in enumerate((name, "", qty, unit, price)):
+                widgets.append(self._make_line_edit(col, text, row, viewport))
+        except Exception:
+            for w in widgets:
+                w.deleteLater()
+            raise
+
+        self.table.insertRow(row)
+        for col, w in enumerate(widgets):
+            self.table.setCellWidget(row, col, w)
+            self._widget_pos[w] = (row, col)
+        self._row_widgets.append(widgets)
+        name_edit = widgets[self.COL_NAME]
+        price_edit = widgets[self.COL_PRICE_PER_UNIT]
+
+        # parsed values for this row; the widgets below keep it up to date
+        values = {"row": row}
+        self._rows.append(values)
+        # connect edits to auto-update Price / unit when relevant fields change;
+        # only the edited row is recomputed
+        for col, key in enumerate(self._ROW_KEYS):
+            w = widgets[col]
+            self._store_value(values, key, w.text())
+            if col in self._PPU_TRIGGER_COLS:
+                w.textChanged.connect(lambda text, v=values, k=key: self._on_row_value_changed(v, k, text))
+        name_edit.textChanged.connect(lambda text, v=values: self._store_value(v, "name", text))
+        price_edit.textChanged.connect(lambda text, v=values: self._on_ppu_text_changed(v, text))
+        return name_edit
+
+    def _make_line_edit(self, col: int, text: str, row: int, parent: QWidget) -> QLineEdit:
+        """Return a configured editor for column *col* of *row*."""
+        w = QLineEdit(text, parent)
+        w.setObjectName(f"{self._OBJECT_NAMES[col]}-{row}")
+        w.installEventFilter(self)
+        if col == self.COL_NAME:
+            # auto-capitalize ingredient name
+            w.setValidator(self._name_validator)
+        else:
+            # allow decimal input
+            w.setValidator(self._num_validator)
+        if col == self.COL_PRICE_PER_UNIT:
+            # Price per unit (read-only, may be auto-filled or copied);
+            # users should not be able to edit or even focus this column
+            w.setReadOnly(True)
+            w.setFocusPolicy(Qt.NoFocus)
+        else:
+            # pressing Enter jumps to next logical field
+            w.returnPressed.connect(lambda w=w: self._focus_next(*self._widget_pos[w]))
+        return w
+
     def remove_selected_row(self) -> None:
+        # pending updates refer to rows by index, so apply them before renumbering
+        if self._update_pending:
+            self._do_recompute_ppu()
         selected = set(idx.row() for idx in self.table.selectedIndexes())
         for r in sorted(selected, reverse=True):
             self.table.removeRow(r)
-        self._update_all_price_per_unit()
+            self._ppu_sum_micro -= self._rows[r]["ppu"] or 0
+            del self._rows[r]
+            for w in self._row_widgets.pop(r):
+                del self._widget_pos[w]
+        # keep the stored row indices in step with the table
+        for r, (values, widgets) in enumerate(zip(self._rows, self._row_widgets)):
+            values["row"] = r
+            for col, w in enumerate(widgets):
+                self._widget_pos[w] = (r, col)
+        # remaining rows are unchanged; only the running sum moved
+        self._update_ppu_sum()
 
     def eventFilter(self, obj, event) -> bool:
         # intercept Enter/Return on any QLineEdit in the table and move focus
         if event.type() == QEvent.KeyPress and isinstance(obj, QLineEdit):
             if event.key() in (Qt.Key_Return, Qt.Key_Enter):
-                idx = self.table.indexAt(obj.mapTo(self.table.viewport(), QPoint(0, 0)))
-                if idx.isValid():
+                rc = self._widget_pos.get(obj)
+                if rc is not None:
+                    r, c = rc
                     # when hitting Enter in the unit (spec) column of the last
                     # row, automatically append a fresh row before moving focus.
-                    if idx.column() == self.COL_UNIT and idx.row() == self.table.rowCount() - 1:
+                    if c == self.COL_UNIT and r == self.table.rowCount() - 1:
                         # row created by Enter should not permanently copy PPU
                         self.add_row(copy_ppu=False)
-                    self._focus_next(idx.row(), idx.column())
+                    self._focus_next(r, c)
                     return True
         return super().eventFilter(obj, event)
 
     def _focus_next(self, row: int, col: int) -> None:
-
         # move focus to the next cell widget in logical order
         next_col = col + 1
         next_row = row
@@ -299,122 +416,127 @@ class CocktailCostDialog(QDialog):
             next_row = row + 1
         if next_row >= self.table.rowCount():
             return
-        w = self.table.cellWidget(next_row, next_col)
+        w = self._row_widgets[next_row][next_col]
         if w is not None:
             w.setFocus()
 
-        # (no longer commit editors; get_recipe deals with active editors)
-        # ensure any itemChanged signals are processed just in case
+    def _parse_optional(self, text: str, empty: Optional[int]) -> Optional[int]:
+        """Parse *text* into micro-units for the row store; ``empty`` is used
+        for blank text and ``None`` marks text that is not a number."""
+        text = text.strip()
+        if not text:
+            return empty
         try:
-            QApplication.processEvents()
-        except Exception:
-            pass
-
-    def remove_selected_row(self) -> None:
-        selected = set(idx.row() for idx in self.table.selectedIndexes())
-        for r in sorted(selected, reverse=True):
-            self.table.removeRow(r)
-        self._update_all_price_per_unit()
-
-    def _update_all_price_per_unit(self, *_args) -> None:
-        for row in range(self.table.rowCount()):
-            self._update_price_per_unit_for_row(row)
-        # recalc and display PPU sum after every sweep
+            return parse_micro(text)
+        except ValueError:
+            return None
+
+    def _store_value(self, values: dict, key: str, text: str) -> None:
+        """Parse a single edited field into the row store."""
+        if key == "name":
+            values["name"] = text.strip()
+        elif key == "unit":
+            # the unit column doubles as the numeric unit spec
+            values["unit"] = text.strip()
+            values["unit_spec"] = self._parse_optional(text, 0)
+        elif key == "row_price":
+            # None for both blank and unparsable text; row_price_entered keeps
+            # them apart (partial input such as "." still clears the PPU)
+            values["row_price"] = self._parse_optional(text, None)
+            values["row_price_entered"] = bool(text.strip())
+        elif key == "qty":
+            values["qty"] = self._parse_optional(text, 0)
+        else:
+            old = values.get("ppu")
+            new = self._parse_optional(text, 0)
+            values["ppu"] = new
+            self._ppu_sum_micro += (new or 0) - (old or 0)
+
+    def _on_row_value_changed(self, values: dict, key: str, text: str) -> None:
+        self._store_value(values, key, text)
+        # without a row price the recompute can neither fill nor clear the
+        # PPU, so don't schedule one (the common case while filling qty/spec)
+        if not values["row_price_entered"]:
+            return
+        self._schedule_recompute(values["row"])
+
+    def _on_ppu_text_changed(self, values: dict, text: str) -> None:
+        self._store_value(values, "ppu", text)
+        self._on_price_per_unit_edited(values["row"])
+        # a pending recompute refreshes the label once it has updated every row
+        if not self._update_pending:
+            self._update_ppu_sum()
+
+    def _schedule_recompute(self, r: int) -> None:
+        """Queue row *r* for a PPU recompute once typing pauses.
+
+        Each call restarts the ``PPU_DEBOUNCE_MS`` timer, so a burst of
+        keystrokes (or several fields set in a row) collapses into a single
+        ``_do_recompute_ppu`` call.  Until the timer fires the row's displayed
+        PPU may be stale: code that reads it (copying into a new row, removing
+        rows) must apply the pending recompute first.
+        """
+        self._pending_rows.add(r)
+        self._update_pending = True
+        self._ppu_timer.start()
+
+    def _do_recompute_ppu(self) -> None:
+        """Recompute every pending row, then refresh the PPU sum once."""
+        self._ppu_timer.stop()
+        if not self._update_pending:
+            return
+        rows, self._pending_rows = self._pending_rows, set()
+        # bound once rather than looked up per pending row
+        update_row = self._update_price_per_unit_for_row
+        n_rows = len(self._rows)
+        for r in rows:
+            if r < n_rows:
+                update_row(r)
         self._update_ppu_sum()
-
-    def _capitalize_first(self, widget: QLineEdit) -> None:
-        """Ensure the first character of the widget text is uppercase."""
-        text = widget.text()
-        if text:
-            new = text[0].upper() + text[1:]
-            if new != text:
-                widget.blockSignals(True)
-                widget.setText(new)
-                widget.blockSignals(False)
-
-    def _set_debug(self, row: int, price: str, qty: str, spec: str, ppu: str) -> None:
-        # show last computation in debug label
-        self.debug_label.setText(f"r{row}: price={price} qty={qty} spec={spec} ppu={ppu}")
-
-    def _parse_decimal(self, text: str) -> Decimal:
-        try:
-            return Decimal(text.strip())
-        except (InvalidOperation, AttributeError):
-            raise ValueError(f"Invalid numeric value: {text}")
+        self._update_pending = False
 
     def _update_ppu_sum(self) -> None:
-        """Compute the sum of all PPU entries and display it."""
-        total = Decimal('0')
-        for r in range(self.table.rowCount()):
-            w = self.table.cellWidget(r, self.COL_PRICE_PER_UNIT)
-            if w is not None and w.text().strip():
-                try:
-                    total += Decimal(w.text())
-                except Exception:
-                    pass
-        # format with two decimals
-        txt = self._format_ppu(total)
-        try:
-            self.ppu_sum_label.setText(f"PPU sum: {txt}")
-        except Exception:
-            pass
+        """Display the running sum of all PPU entries.
+
+        The sum is kept in micro-units, so this is integer formatting only
+        (two decimals, half up) with no Decimal quantize.
+        """
+        self.ppu_sum_label.setText(f"PPU sum: {format_money(self._ppu_sum_micro)}")
 
     def get_recipe(self) -> Recipe:
         name = self.name_edit.text().strip()
         # servings control removed; default to 1
         servings = 1
-        ingredients = []
-
-        # gather any open delegate editors so we can read uncommitted values
-        active_editor_text = {}
-        cell_widgets = set()
-        for r in range(self.table.rowCount()):
-            for c in range(self.table.columnCount()):
-                w = self.table.cellWidget(r, c)
-                if w is not None:
-                    cell_widgets.add(w)
-
-        for editor in self.table.findChildren(QLineEdit):
-            if editor in cell_widgets:
-                continue
-            if not editor.isVisible():
-                continue
-            idx = self.table.indexAt(editor.mapTo(self.table.viewport(), QPoint(0, 0)))
-            if idx.isValid():
-                active_editor_text[(idx.row(), idx.column())] = editor.text()
-
-        for r in range(self.table.rowCount()):
-            name_w: QLineEdit = self.table.cellWidget(r, self.COL_NAME)
-            row_price_w: QLineEdit = self.table.cellWidget(r, self.COL_ROW_PRICE)
-            qty_w: QLineEdit = self.table.cellWidget(r, self.COL_QTY)
-            unit_w: QLineEdit = self.table.cellWidget(r, self.COL_UNIT)
-            price_w: QLineEdit = self.table.cellWidget(r, self.COL_PRICE_PER_UNIT)
-
-            if not name_w or not name_w.text().strip():
-                continue  # skip empty rows
-            ing_name = name_w.text().strip()
-            qty = self._parse_decimal(qty_w.text() or "0")
-            unit = (unit_w.text() or "").strip()
-
-            # prefer user-entered total price (row price)
-            row_price_val = None
-            if row_price_w and row_price_w.text().strip():
-                try:
-                    row_price_val = Decimal(row_price_w.text().strip())
-                except Exception:
-                    row_price_val = None
-
-            if row_price_val is not None and qty > 0:
-                price = row_price_val / qty
-            else:
-                price = self._parse_decimal(price_w.text() or "0")
-
-            ingredient = Ingredient(name=ing_name, quantity=qty, unit=unit, price_per_unit=price)
-            ingredients.append(ingredient)
+        make = self._row_ingredient
+        # rows without a name are skipped
+        ingredients = [make(r, values) for r, values in enumerate(self._rows) if values["name"]]
 
         recipe = Recipe(name=name, ingredients=ingredients, servings=servings)
         return recipe
 
+    def _row_ingredient(self, r: int, values: dict) -> Ingredient:
+        """Build the Ingredient for row *r* from its stored values."""
+        qty_micro = values["qty"]
+        if qty_micro is None:
+            raise ValueError(f"Invalid numeric value: {self._row_widgets[r][self.COL_QTY].text()}")
+
+        # prefer user-entered total price (row price); the scales cancel
+        row_price_micro = values["row_price"]
+        if row_price_micro is not None and qty_micro > 0:
+            price = Decimal(row_price_micro) / Decimal(qty_micro)
+        else:
+            ppu_micro = values["ppu"]
+            if ppu_micro is None:
+                raise ValueError(f"Invalid numeric value: {self._row_widgets[r][self.COL_PRICE_PER_UNIT].text()}")
+            price = Decimal(ppu_micro) / _SCALE_D
+
+        return Ingredient(
+            name=values["name"],
+            quantity=Decimal(qty_micro) / _SCALE_D,
+            unit=values["unit"],
+            price_per_unit=price,
+        )
+
     def validate(self) -> None:
         recipe = self.get_recipe()
         # basic validation — reuse model validation
@@ -428,71 +550,38 @@ class CocktailCostDialog(QDialog):
         # no automatic action required; leave value as user-entered
         return
 
-    def _format_ppu(self, value: Decimal) -> str:
-        """Return a string for *value* rounded to two decimal places.
+    def _compute_ppu_micro(self, values: dict) -> Optional[int]:
+        """Return the row's price per unit in micro-units, or None when the
+        row price, quantity or unit spec needed for it is missing.
 
-        The UI should always display exactly two digits after the decimal
-        point (e.g. ``0.20`` rather than ``0.2`` or ``0.200000``).  We use
-        ROUND_HALF_UP to mimic typical financial rounding.
+        Formula: price_per_unit = row_price * (unit_spec / product_quantity);
+        the SCALE factors cancel to leave micro-units, rounded half up.
         """
-        try:
-            out = value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            # format with 'f' to preserve trailing zeros
-            return format(out, 'f')
-        except Exception:
-            # fallback to whatever string representation the Decimal gives
-            return str(value)
+        row_price = values["row_price"]
+        qty = values["qty"]
+        unit_spec = values["unit_spec"]
+        if row_price is not None and qty and qty > 0 and unit_spec and unit_spec > 0:
+            return (row_price * unit_spec + qty // 2) // qty
+        return None
 
     def _update_price_per_unit_for_row(self, r: int) -> None:
         """Compute Price / unit from: Price / (Product Quantity / UnitSpec)
 
-        Formula: price_per_unit = row_price * (unit_spec / product_quantity)
         This runs when Price (row), Product Quantity or Unit Spec change.
+        Only the stored values of row *r* are used, so nothing is re-parsed.
         """
         try:
-            # get widgets/items for the row
-            row_price_w: QLineEdit = self.table.cellWidget(r, self.COL_ROW_PRICE)
-            qty_w: QLineEdit = self.table.cellWidget(r, self.COL_QTY)
-            unit_spec_w: QLineEdit = self.table.cellWidget(r, self.COL_UNIT)
-            ppu_w: QLineEdit = self.table.cellWidget(r, self.COL_PRICE_PER_UNIT)
-
-            row_price_text = (row_price_w.text().strip() if row_price_w and row_price_w.text() else "")
-
-            qty_text = (qty_w.text().strip() if qty_w and qty_w.text() else "0")
-            unit_spec_text = (unit_spec_w.text().strip() if unit_spec_w and unit_spec_w.text() else "0")
+            values = self._rows[r]
+            ppu_w: QLineEdit = self._row_widgets[r][self.COL_PRICE_PER_UNIT]
+            ppu = self._compute_ppu_micro(values)
 
-            # parse numbers
-            try:
-                row_price = Decimal(row_price_text) if row_price_text else None
-            except Exception:
-                row_price = None
-            try:
-                qty = Decimal(qty_text)
-            except Exception:
-                qty = Decimal("0")
-            try:
-                unit_spec = Decimal(unit_spec_text)
-            except Exception:
-                unit_spec = Decimal("0")
-
-            if row_price is not None and qty > 0 and unit_spec > 0:
-                # price_per_unit = row_price / (qty / unit_spec) == row_price * (unit_spec / qty)
-                ppu = (row_price * (unit_spec / qty)).quantize(Decimal("0.000001"))
+            if ppu is not None:
                 # format for display with exactly two decimals
-                ppu_str = self._format_ppu(ppu)
-                if ppu_w is not None:
-                    ppu_w.setText(ppu_str)
-                # debug information no longer shown
-                # (retain _set_debug for potential logging)
-                self._set_debug(r, row_price_text, qty_text, unit_spec_text, ppu_str)
-            elif row_price_text:
+                ppu_w.setText(format_money(ppu))
+            elif values["row_price_entered"]:
                 # if user has started entering row price but required numeric
                 # inputs are incomplete/invalid, clear ppu for this row.
-                if ppu_w is not None:
-                    ppu_w.setText("")
-                self._set_debug(r, row_price_text, qty_text, unit_spec_text, "")
-                if ppu_w is not None:
-                    ppu_w.setText("")
+                ppu_w.setText("")
         except Exception:
             # ignore errors in auto-update
             return
@@ -508,39 +597,21 @@ class CocktailCostDialog(QDialog):
             total = calculate_total_cost(recipe)
             per = calculate_cost_per_serving(recipe)
 
-            # update per-row price column (quantity * price_per_unit) — but preserve user-entered values
-            for r in range(self.table.rowCount()):
-                name_w: QLineEdit = self.table.cellWidget(r, self.COL_NAME)
-                if not name_w or not name_w.text().strip():
-                    continue
-                row_price_w: QLineEdit = self.table.cellWidget(r, self.COL_ROW_PRICE)
-                qty_w: QLineEdit = self.table.cellWidget(r, self.COL_QTY)
-                price_w: QLineEdit = self.table.cellWidget(r, self.COL_PRICE_PER_UNIT)
-                item_text = (row_price_w.text().strip() if row_price_w and row_price_w.text() else "")
-
-                # parse numeric qty and ppu for computed fallback
-                try:
-                    qty = Decimal(qty_w.text() or "0")
-                except Exception:
-                    qty = Decimal("0")
-                try:
-                    ppu = Decimal(price_w.text() or "0")
-                except Exception:
-                    ppu = Decimal("0")
-
-                # if user provided a row price, use it; otherwise compute from qty*ppu
-                if item_text:
-                    try:
-                        displayed_row_cost = Decimal(item_text).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                    except Exception:
-                        displayed_row_cost = Decimal("0.00")
-                else:
-                    displayed_row_cost = (qty * ppu).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-                # keep user-entered row price when provided; otherwise show computed
-                # value in the editable row-price widget for transparency.
-                if row_price_w is not None and not item_text:
-                    row_price_w.setText(str(displayed_row_cost))
+            # update per-row price column (quantity * price_per_unit) — but preserve user-entered values;
+            # the table repaints once after the loop, and the PPU recomputes the
+            # new row prices schedule are coalesced by the debounce timer
+            self.table.setUpdatesEnabled(False)
+            try:
+                for r, values in enumerate(self._rows):
+                    # any text the user typed, even if not a valid number, is kept
+                    if not values["name"] or values["row_price_entered"]:
+                        continue
+                    # no row price entered: show the computed qty * ppu value in the
+                    # editable row-price widget for transparency
+                    row_cost = (values["qty"] or 0) * (values["ppu"] or 0)
+                    self._row_widgets[r][self.COL_ROW_PRICE].setText(format_money(row_cost, scale=SCALE * SCALE))
+            finally:
+                self.table.setUpdatesEnabled(True)
 
             # total/per labels removed from UI; application logic unaffected
             pass
@@ -555,59 +626,3 @@ class CocktailCostDialog(QDialog):
             super().accept()
         except Exception as exc:
             QMessageBox.warning(self, "Validation", str(exc))
-
-    def _commit_table_editors(self) -> None:
-        """Close or commit any active editor so edits are written to the item.
-
-        This handles both persistent editors (closePersistentEditor) and
-        the normal delegate-created editor (commitData/closeEditor) by
-        inspecting the currently focused widget.
-        """
-        try:
-            # snapshot cell widgets so we don't accidentally treat them as
-            # transient delegate editors below
-            cell_widgets = set()
-            for r in range(self.table.rowCount()):
-                for c in range(self.table.columnCount()):
-                    w = self.table.cellWidget(r, c)
-                    if w is not None:
-                        cell_widgets.add(w)
-
-            # If the currently focused widget is a delegate editor inside the table,
-            # commit and close it immediately (pressed/release ordering can change focus).
-            # However we must **not** operate on persistent cell widgets, only on
-            # editors created by the item delegate.  The focus widget is sometimes one
-            # of our QLineEdit cell widgets, so skip it if it appears in the set above.
-            fw = self.table.focusWidget() or QApplication.focusWidget()
-            if isinstance(fw, QLineEdit) and fw not in cell_widgets:
-                parent = fw
-                while parent is not None:
-                    # delegate editors are often children of the viewport — accept either
-                    if parent is self.table or parent is self.table.viewport():
-                        try:
-                            self.table.commitData(fw)
-                            self.table.closeEditor(fw, QAbstractItemDelegate.NoHint)
-                        except Exception:
-                            pass
-                        break
-                    parent = parent.parent()
-
-            # attempt to find any other delegate-created editor widgets (QLineEdit)
-            # inside the table and commit/close them. Exclude cellWidget editors.
-            for child in self.table.findChildren(QLineEdit):
-                if child in cell_widgets:
-                    continue
-                if not child.isVisible():
-                    continue
-                try:
-                    self.table.commitData(child)
-                    self.table.closeEditor(child, QAbstractItemDelegate.NoHint)
-                except Exception:
-                    pass
-
-            # also ensure persistent editor (if any) is closed for the current item
-            current = self.table.currentItem()
-            if current is not None:
-                self.table.closePersistentEditor(current)
-        except Exception:
-            pass
@@ -1,10 +1,31 @@
+from array import array
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 import json
 
+try:
+    import orjson  # optional: faster JSON encode/decode straight to bytes
+except ImportError:
+    orjson = None
 
-@dataclass
+# types Ingredient coerces to Decimal
+_NUMERIC_COERCIBLE = (int, float, str)
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(slots=True)
 class Ingredient:
     name: str
     quantity: Decimal
@@ -12,17 +33,21 @@ class Ingredient:
     price_per_unit: Decimal
 
     def __post_init__(self):
-        # normalize numeric types to Decimal
-        if isinstance(self.quantity, (int, float, str)):
-            self.quantity = Decimal(str(self.quantity))
-        if isinstance(self.price_per_unit, (int, float, str)):
-            self.price_per_unit = Decimal(str(self.price_per_unit))
+        # normalize numeric types to Decimal; Decimals (the common case) are
+        # caught by the cheap type() identity check and strings skip str()
+        q = self.quantity
+        if type(q) is not Decimal and isinstance(q, _NUMERIC_COERCIBLE):
+            self.quantity = Decimal(q if type(q) is str else str(q))
+        p = self.price_per_unit
+        if type(p) is not Decimal and isinstance(p, _NUMERIC_COERCIBLE):
+            self.price_per_unit = Decimal(p if type(p) is str else str(p))
 
-        if not self.name or not self.name.strip():
-            raise ValueError("Ingredient name must be non-empty")
-        if self.quantity <= 0:
-            raise ValueError("Ingredient quantity must be > 0")
-        if self.price_per_unit < 0:
+        # single check on the valid path; work out which rule failed only on error
+        if not self.name or not self.name.strip() or self.quantity <= 0 or self.price_per_unit < 0:
+            if not self.name or not self.name.strip():
+                raise ValueError("Ingredient name must be non-empty")
+            if self.quantity <= 0:
+                raise ValueError("Ingredient quantity must be > 0")
             raise ValueError("Ingredient price_per_unit must be >= 0")
 
     def to_dict(self) -> Dict[str, Any]:
@@ -35,15 +60,54 @@ class Ingredient:
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "Ingredient":
+        # __post_init__ coerces the numeric strings to_dict writes (and ints,
+        # floats) to Decimal, so values are passed through unconverted
         return Ingredient(
             name=d["name"],
-            quantity=Decimal(str(d["quantity"])),
+            quantity=d["quantity"],
             unit=d.get("unit", ""),
-            price_per_unit=Decimal(str(d["price_per_unit"])),
+            price_per_unit=d["price_per_unit"],
         )
 
 
-@dataclass
+class IngredientTable:
+    """Struct-of-arrays ingredient store for bulk cost sweeps.
+
+    Quantities and prices per unit are packed into ``array('d')`` columns so
+    a total is one pass over two float arrays. It is not a list: it has no
+    indexing, and ``append`` takes the column values.  Iterating yields
+    ``Ingredient`` objects built on demand, so ``list(table)`` gives an
+    ingredient list for a ``Recipe``.
+    """
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self.units: List[str] = []
+        self.qty = array("d")
+        self.ppu = array("d")
+
+    def append(self, name: str, qty: float, ppu: float, unit: str = "") -> None:
+        self.names.append(name)
+        self.units.append(unit)
+        self.qty.append(float(qty))
+        self.ppu.append(float(ppu))
+
+    @staticmethod
+    def from_ingredients(ingredients: List[Ingredient]) -> "IngredientTable":
+        table = IngredientTable()
+        for ing in ingredients:
+            table.append(ing.name, ing.quantity, ing.price_per_unit, ing.unit)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[Ingredient]:
+        for name, unit, q, p in zip(self.names, self.units, self.qty, self.ppu):
+            yield Ingredient(name=name, quantity=q, unit=unit, price_per_unit=p)
+
+
+@dataclass(slots=True)
 class Recipe:
     name: str
     ingredients: List[Ingredient] = field(default_factory=list)
@@ -54,10 +118,10 @@ class Recipe:
             raise ValueError("Recipe name is required")
         if self.servings < 1:
             raise ValueError("Servings must be >= 1")
-        for ing in self.ingredients:
-            if not isinstance(ing, Ingredient):
-                raise ValueError("All ingredients must be Ingredient instances")
-            # Ingredient.__post_init__ already validates individual fields
+        # Ingredient.__post_init__ already validates individual fields; stop
+        # at the first entry that is not an Ingredient
+        if any(not isinstance(i, Ingredient) for i in self.ingredients):
+            raise ValueError("All ingredients must be Ingredient instances")
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -72,11 +136,12 @@ class Recipe:
         return Recipe(name=d.get("name", ""), ingredients=ings, servings=int(d.get("servings", 1)))
 
     def save_to_json(self, path: str) -> None:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        # to_dict already stringifies Decimals, which orjson cannot encode
+        with open(path, "wb") as f:
+            f.write(_dumps(self.to_dict()))
 
     @staticmethod
     def load_from_json(path: str) -> "Recipe":
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            data = _loads(f.read())
         return Recipe.from_dict(data)
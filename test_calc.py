@@ -1,7 +1,9 @@
 from decimal import Decimal
 
-from model import Ingredient, Recipe
-from calc import calculate_total_cost, calculate_cost_per_serving
+import pytest
+
+from model import Ingredient, IngredientTable, Recipe
+from calc import calculate_table_cost, calculate_total_cost, calculate_cost_per_serving
 
 
 def test_calculate_total_and_per_serving():
@@ -32,3 +34,89 @@ def test_invalid_servings_raises():
         assert False, "expected ValueError"
     except ValueError:
         pass
+
+
+def test_calculate_table_cost_float_sweep():
+    ingredients = [
+        Ingredient(name="Gin", quantity=Decimal("50"), unit="ml", price_per_unit=Decimal("0.02")),
+        Ingredient(name="Tonic", quantity=Decimal("150"), unit="ml", price_per_unit=Decimal("0.001")),
+    ]
+    table = IngredientTable.from_ingredients(ingredients)
+    assert calculate_table_cost(table) == Decimal("1.15")
+
+
+def test_table_cost_can_differ_from_exact_total_by_a_cent():
+    ingredients = [
+        Ingredient(name="A", quantity=Decimal("25"), unit="g", price_per_unit=Decimal("2.2656")),
+        Ingredient(name="B", quantity=Decimal("10"), unit="g", price_per_unit=Decimal("71.085")),
+        Ingredient(name="C", quantity=Decimal("50"), unit="g", price_per_unit=Decimal("4.0781")),
+    ]
+    table = IngredientTable.from_ingredients(ingredients)
+
+    # the float sweep lands just below the half cent the exact sum rounds up from
+    assert calculate_table_cost(table) == Decimal("971.39")
+    assert calculate_total_cost(Recipe(name="L", ingredients=ingredients)) == Decimal("971.40")
+    # rebuilding Ingredients from the table keeps the exact Decimal total
+    assert calculate_total_cost(Recipe(name="T", ingredients=list(table))) == Decimal("971.40")
+
+
+def _bulk_recipes():
+    gin = Ingredient(name="Gin", quantity=Decimal("50"), unit="ml", price_per_unit=Decimal("0.02"))
+    tonic = Ingredient(name="Tonic", quantity=150, unit="ml", price_per_unit=0.001)
+    lime = Ingredient(name="Lime", quantity="2", unit="", price_per_unit="0.35")
+    return [
+        Recipe(name="Empty first", ingredients=[]),
+        Recipe(name="G&T", ingredients=[gin, tonic, lime]),
+        Recipe(name="Empty", ingredients=[]),
+        Recipe(name="Neat", ingredients=[gin]),
+    ]
+
+
+_BULK_TOTALS = [Decimal("0.00"), Decimal("1.85"), Decimal("0.00"), Decimal("1.00")]
+
+
+def test_bulk_total_without_numpy_uses_decimal_path(monkeypatch):
+    import calc_fast
+
+    monkeypatch.setattr(calc_fast, "np", None)
+    assert calc_fast.calculate_total_cost_bulk(_bulk_recipes()) == _BULK_TOTALS
+
+
+def test_bulk_total_array_path():
+    np = pytest.importorskip("numpy")
+    import calc_fast
+
+    qty, ppu, offsets = calc_fast.flatten_recipes(_bulk_recipes())
+    assert offsets.tolist() == [0, 0, 3, 3, 4]
+    assert qty.dtype == ppu.dtype == np.float64
+    assert qty.tolist() == [50.0, 150.0, 2.0, 50.0]
+
+    assert calc_fast.calculate_total_cost_bulk(_bulk_recipes()) == _BULK_TOTALS
+
+
+def test_bulk_total_bincount_path(monkeypatch):
+    pytest.importorskip("numpy")
+    import calc_fast
+
+    # without numba the per-recipe sums come from np.bincount
+    monkeypatch.setattr(calc_fast, "numba", None)
+    assert calc_fast.calculate_total_cost_bulk(_bulk_recipes()) == _BULK_TOTALS
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_bulk_total_can_differ_from_exact_total_by_a_cent(monkeypatch, use_numba):
+    pytest.importorskip("numpy")
+    import calc_fast
+
+    if not use_numba:
+        monkeypatch.setattr(calc_fast, "numba", None)
+    elif calc_fast.numba is None:
+        pytest.skip("numba not installed")
+    recipe = Recipe(name="Float", ingredients=[
+        Ingredient(name="A", quantity=Decimal("25"), unit="g", price_per_unit=Decimal("2.2656")),
+        Ingredient(name="B", quantity=Decimal("10"), unit="g", price_per_unit=Decimal("71.085")),
+        Ingredient(name="C", quantity=Decimal("50"), unit="g", price_per_unit=Decimal("4.0781")),
+    ])
+    # the float64 sweep lands just below the half cent the exact sum rounds up from
+    assert calculate_total_cost(recipe) == Decimal("971.40")
+    assert calc_fast.calculate_total_cost_bulk([recipe]) == [Decimal("971.39")]
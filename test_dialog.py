@@ -6,6 +6,7 @@ from decimal import Decimal
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QApplication, QLineEdit
 
+from calc import MONEY_QUANT
 from cost_dialog import CocktailCostDialog
 from model import Ingredient, Recipe
 
@@ -18,28 +19,15 @@ def test_dialog_calculate_updates_labels(qtbot):
     dlg.name_edit.setText("TestCocktail")
 
     # ensure single row exists; populate it
-    # find cell widgets and set values
-    name_w = dlg.table.cellWidget(0, dlg.COL_NAME)
-    qty_w = dlg.table.cellWidget(0, dlg.COL_QTY)
-    unit_w = dlg.table.cellWidget(0, dlg.COL_UNIT)
-    price_w = dlg.table.cellWidget(0, dlg.COL_PRICE_PER_UNIT)
-
-    name_w.setText("Gin")
-    qty_w.setText("50")
-    unit_w.setText("ml")
-    price_w.setText("0.02")
+    dlg.populate_row(0, name="Gin", qty="50", unit="ml", ppu="0.02")
 
-    # add a second ingredient row and populate
+    # add a second ingredient row and populate it through its editors
     dlg.add_row()
-    name_w = dlg.table.cellWidget(1, dlg.COL_NAME)
-    qty_w = dlg.table.cellWidget(1, dlg.COL_QTY)
-    unit_w = dlg.table.cellWidget(1, dlg.COL_UNIT)
-    price_w = dlg.table.cellWidget(1, dlg.COL_PRICE_PER_UNIT)
-
-    name_w.setText("Tonic")
-    qty_w.setText("150")
-    unit_w.setText("ml")
-    price_w.setText("0.001")
+    dlg.table.cellWidget(1, dlg.COL_NAME).setText("Tonic")
+    dlg.table.cellWidget(1, dlg.COL_QTY).setText("150")
+    dlg.table.cellWidget(1, dlg.COL_UNIT).setText("ml")
+    dlg.table.cellWidget(1, dlg.COL_PRICE_PER_UNIT).setText("0.001")
+    assert [i.name for i in dlg.get_recipe().ingredients] == ["Gin", "Tonic"]
 
     # trigger calculation
     dlg.on_calculate()
@@ -73,33 +61,18 @@ def test_row_price_user_input_overrides_unit_price(qtbot):
     dlg.name_edit.setText("TestCocktail")
 
     # populate first row
-    name_w = dlg.table.cellWidget(0, dlg.COL_NAME)
-    qty_w = dlg.table.cellWidget(0, dlg.COL_QTY)
-    unit_w = dlg.table.cellWidget(0, dlg.COL_UNIT)
-    price_w = dlg.table.cellWidget(0, dlg.COL_PRICE_PER_UNIT)
-
-    name_w.setText("Gin")
-    qty_w.setText("50")
-    unit_w.setText("ml")
-    price_w.setText("0.02")
+    dlg.populate_row(0, name="Gin", qty="50", unit="ml", ppu="0.02")
 
     # add second row
     dlg.add_row()
-    name_w = dlg.table.cellWidget(1, dlg.COL_NAME)
-    qty_w = dlg.table.cellWidget(1, dlg.COL_QTY)
-    unit_w = dlg.table.cellWidget(1, dlg.COL_UNIT)
-    price_w = dlg.table.cellWidget(1, dlg.COL_PRICE_PER_UNIT)
-
-    name_w.setText("Tonic")
-    qty_w.setText("150")
-    unit_w.setText("ml")
-    price_w.setText("0.001")
+    dlg.populate_row(1, name="Tonic", qty="150", unit="ml", ppu="0.001")
 
     # initial calculation
     dlg.on_calculate()
     assert dlg.table.cellWidget(0, dlg.COL_ROW_PRICE).text() == "1.00"
 
-    # user overrides the row Price for the first ingredient
+    # user overrides the row Price for the first ingredient (through the
+    # editor's textChanged, not populate_row)
     dlg.table.cellWidget(0, dlg.COL_ROW_PRICE).setText("1.50")
     dlg.on_calculate()
 
@@ -154,32 +127,23 @@ def test_new_row_behaves_same(qtbot):
     qtbot.addWidget(dlg)
 
     # populate first row
-    name0 = dlg.table.cellWidget(0, dlg.COL_NAME)
-    qty0 = dlg.table.cellWidget(0, dlg.COL_QTY)
-    unit0 = dlg.table.cellWidget(0, dlg.COL_UNIT)
-    ppu0 = dlg.table.cellWidget(0, dlg.COL_PRICE_PER_UNIT)
+    dlg.populate_row(0, name="Gin", qty="50", unit="1", ppu="0.02")
 
-    name0.setText("Gin")
-    qty0.setText("50")
-    unit0.setText("1")
-    ppu0.setText("0.02")
-
-    # add second row — populate it and verify auto-calculation behaves the same
+    # add second row — populate it through the editors so the new row's
+    # textChanged -> row store wiring is exercised
     dlg.add_row()
     name1 = dlg.table.cellWidget(1, dlg.COL_NAME)
     assert name1 is not None
-
-    # populate second row and verify auto-calculation behaves the same
-    qty1 = dlg.table.cellWidget(1, dlg.COL_QTY)
-    unit1 = dlg.table.cellWidget(1, dlg.COL_UNIT)
-    ppu1 = dlg.table.cellWidget(1, dlg.COL_PRICE_PER_UNIT)
-
-    name1.setText("Tonic")
-    qty1.setText("150")
-    unit1.setText("1")
-    ppu1.setText("0.001")
+    name1.setText("tonic")
+    dlg.table.cellWidget(1, dlg.COL_QTY).setText("150")
+    dlg.table.cellWidget(1, dlg.COL_UNIT).setText("1")
+    dlg.table.cellWidget(1, dlg.COL_PRICE_PER_UNIT).setText("0.001")
 
     # preconditions: make sure cellWidget text values are set
+    name0 = dlg.table.cellWidget(0, dlg.COL_NAME)
+    qty0 = dlg.table.cellWidget(0, dlg.COL_QTY)
+    unit0 = dlg.table.cellWidget(0, dlg.COL_UNIT)
+    ppu0 = dlg.table.cellWidget(0, dlg.COL_PRICE_PER_UNIT)
     assert name0.text() == "Gin"
     assert qty0.text() == "50"
     assert unit0.text() == "1"
@@ -195,6 +159,10 @@ def test_new_row_behaves_same(qtbot):
     assert recipe.ingredients[0].name == "Gin"
     assert recipe.ingredients[0].quantity ==  Decimal("50")
     assert recipe.ingredients[0].price_per_unit == Decimal("0.02")
+    assert recipe.ingredients[1].name == "Tonic"
+    assert recipe.ingredients[1].quantity == Decimal("150")
+    assert recipe.ingredients[1].price_per_unit == Decimal("0.001")
+    qtbot.waitUntil(lambda: dlg.ppu_sum_label.text().endswith("0.02"), timeout=500)
 
     # trigger calculation and verify totals include both rows
     dlg.on_calculate()
@@ -342,8 +310,8 @@ def test_second_row_live_ppu_typing(qtbot):
     row_price1.setText("18")
     from decimal import Decimal
     ppu1 = dlg.table.cellWidget(1, dlg.COL_PRICE_PER_UNIT)
-    qtbot.waitUntil(lambda: Decimal(ppu1.text() or "0").quantize(Decimal("0.01")) == Decimal("0.64"), timeout=500)
-    assert Decimal(ppu1.text() or "0").quantize(Decimal("0.01")) == Decimal("0.64")
+    qtbot.waitUntil(lambda: Decimal(ppu1.text() or "0").quantize(MONEY_QUANT) == Decimal("0.64"), timeout=500)
+    assert Decimal(ppu1.text() or "0").quantize(MONEY_QUANT) == Decimal("0.64")
 
 
 def test_second_row_spec_last_triggers_ppu(qtbot):
@@ -366,8 +334,8 @@ def test_second_row_spec_last_triggers_ppu(qtbot):
     dlg.table.cellWidget(1, dlg.COL_UNIT).setText("25")
     ppu1 = dlg.table.cellWidget(1, dlg.COL_PRICE_PER_UNIT)
     from decimal import Decimal
-    qtbot.waitUntil(lambda: Decimal(ppu1.text() or "0").quantize(Decimal("0.01")) == Decimal("0.64"), timeout=500)
-    assert Decimal(ppu1.text() or "0").quantize(Decimal("0.01")) == Decimal("0.64")
+    qtbot.waitUntil(lambda: Decimal(ppu1.text() or "0").quantize(MONEY_QUANT) == Decimal("0.64"), timeout=500)
+    assert Decimal(ppu1.text() or "0").quantize(MONEY_QUANT) == Decimal("0.64")
     # debug label should reflect the same computation
 
 
@@ -396,8 +364,8 @@ def test_second_row_price_qty_spec_typing_order(qtbot):
 
     from decimal import Decimal
     from decimal import Decimal
-    qtbot.waitUntil(lambda: Decimal(ppu1.text() or "0").quantize(Decimal("0.01")) == Decimal("0.64"), timeout=700)
-    assert Decimal(ppu1.text() or "0").quantize(Decimal("0.01")) == Decimal("0.64")
+    qtbot.waitUntil(lambda: Decimal(ppu1.text() or "0").quantize(MONEY_QUANT) == Decimal("0.64"), timeout=700)
+    assert Decimal(ppu1.text() or "0").quantize(MONEY_QUANT) == Decimal("0.64")
 
 
 def test_enter_moves_to_next_field(qtbot):
@@ -466,12 +434,12 @@ def test_add_row_commits_uncommitted_price_and_copies_ppu(qtbot):
     # first ensure row0 PPU was computed
     from decimal import Decimal
     ppu0 = dlg.table.cellWidget(0, dlg.COL_PRICE_PER_UNIT)
-    qtbot.waitUntil(lambda: Decimal(ppu0.text() or "0").quantize(Decimal("0.01")) == Decimal("1.80"), timeout=500)
+    qtbot.waitUntil(lambda: Decimal(ppu0.text() or "0").quantize(MONEY_QUANT) == Decimal("1.80"), timeout=500)
 
     # expected ppu copied to row1
     ppu1 = dlg.table.cellWidget(1, dlg.COL_PRICE_PER_UNIT)
-    qtbot.waitUntil(lambda: Decimal(ppu1.text() or "0").quantize(Decimal("0.01")) == Decimal("1.80"), timeout=500)
-    assert Decimal(ppu1.text() or "0").quantize(Decimal("0.01")) == Decimal("1.80")
+    qtbot.waitUntil(lambda: Decimal(ppu1.text() or "0").quantize(MONEY_QUANT) == Decimal("1.80"), timeout=500)
+    assert Decimal(ppu1.text() or "0").quantize(MONEY_QUANT) == Decimal("1.80")
 
 
 def test_ppu_always_two_decimals(qtbot):
@@ -537,3 +505,248 @@ def test_enter_in_unit_appends_row(qtbot):
 
 
 
+def test_remove_row_keeps_values_in_step(qtbot):
+    """Removing a row must not leave later rows updating the wrong entry."""
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+
+    dlg.name_edit.setText("Remove")
+    dlg.table.cellWidget(0, dlg.COL_NAME).setText("first")
+    dlg.add_row()
+    dlg.table.cellWidget(1, dlg.COL_NAME).setText("second")
+    dlg.table.cellWidget(1, dlg.COL_QTY).setText("700")
+    dlg.table.cellWidget(1, dlg.COL_UNIT).setText("25")
+
+    dlg.table.selectRow(0)
+    dlg.remove_selected_row()
+    assert dlg.table.rowCount() == 1
+
+    # the surviving row is now row 0 and must still recompute its own ppu
+    dlg.table.cellWidget(0, dlg.COL_ROW_PRICE).setText("18")
+    ppu0 = dlg.table.cellWidget(0, dlg.COL_PRICE_PER_UNIT)
+    qtbot.waitUntil(lambda: ppu0.text() == "0.64", timeout=500)
+    assert dlg.ppu_sum_label.text().endswith("0.64")
+
+    recipe = dlg.get_recipe()
+    assert [i.name for i in recipe.ingredients] == ["Second"]
+
+
+def test_micro_unit_helpers():
+    from cost_dialog import SCALE, format_money, parse_micro
+
+    assert parse_micro("0.02") == 20_000
+    assert parse_micro("18") == 18 * SCALE
+    assert format_money(642_857) == "0.64"
+    assert format_money(1_005_000) == "1.01"
+    assert format_money(-500_000) == "-0.50"
+    with pytest.raises(ValueError):
+        parse_micro("ml")
+    # repeated strings are served from the cache; errors are never cached
+    hits = parse_micro.cache_info().hits
+    assert parse_micro("0.02") == 20_000
+    assert parse_micro.cache_info().hits == hits + 1
+    with pytest.raises(ValueError):
+        parse_micro("ml")
+
+
+def test_ppu_updates_are_coalesced(qtbot):
+    """Several edits in one event-loop pass recompute the row only once."""
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+
+    ppu0 = dlg.table.cellWidget(0, dlg.COL_PRICE_PER_UNIT)
+    changes = []
+    ppu0.textChanged.connect(changes.append)
+
+    dlg.table.cellWidget(0, dlg.COL_ROW_PRICE).setText("3")
+    dlg.table.cellWidget(0, dlg.COL_QTY).setText("5")
+    dlg.table.cellWidget(0, dlg.COL_QTY).setText("50")
+    dlg.table.cellWidget(0, dlg.COL_UNIT).setText("2")
+    # nothing is recomputed until control returns to the event loop
+    assert changes == []
+
+    qtbot.waitUntil(lambda: ppu0.text() == "0.12", timeout=500)
+    assert changes == ["0.12"]
+    assert dlg.ppu_sum_label.text().endswith("0.12")
+
+
+def test_add_rows_bulk_insert(qtbot):
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+
+    dlg.name_edit.setText("Bulk")
+    dlg.table.cellWidget(0, dlg.COL_NAME).setText("Gin")
+    dlg.table.cellWidget(0, dlg.COL_QTY).setText("50")
+    dlg.table.cellWidget(0, dlg.COL_PRICE_PER_UNIT).setText("0.02")
+
+    dlg.add_rows([
+        {"name": "Tonic", "qty": "150", "unit": "ml", "price": "0.001"},
+        {"name": "Lime", "qty": "1", "unit": "pc", "price": "0.25"},
+    ])
+
+    assert dlg.table.rowCount() == 3
+    assert dlg.table.updatesEnabled()
+    assert dlg.table.cellWidget(2, dlg.COL_PRICE_PER_UNIT).text() == "0.25"
+    # 0.02 + 0.001 + 0.25
+    assert dlg.ppu_sum_label.text().endswith("0.27")
+
+    recipe = dlg.get_recipe()
+    assert [i.name for i in recipe.ingredients] == ["Gin", "Tonic", "Lime"]
+    assert recipe.ingredients[1].price_per_unit == Decimal("0.001")
+
+
+def test_enter_navigation_after_remove(qtbot):
+    """Rows shifted up by a removal must still navigate from their new index."""
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+
+    dlg.add_row()
+    dlg.table.selectRow(0)
+    dlg.remove_selected_row()
+    assert dlg.table.rowCount() == 1
+
+    name0 = dlg.table.cellWidget(0, dlg.COL_NAME)
+    name0.setFocus()
+    qtbot.keyClick(name0, Qt.Key_Enter)
+    assert dlg.focusWidget() is dlg.table.cellWidget(0, dlg.COL_ROW_PRICE)
+
+    unit0 = dlg.table.cellWidget(0, dlg.COL_UNIT)
+    unit0.setFocus()
+    qtbot.keyClick(unit0, Qt.Key_Enter)
+    assert dlg.table.rowCount() == 2
+    assert dlg.focusWidget() is dlg.table.cellWidget(1, dlg.COL_NAME)
+
+
+def test_format_money_two_decimals():
+    from cost_dialog import SCALE, format_money, parse_micro
+
+    assert format_money(parse_micro("0.642857")) == "0.64"
+    assert format_money(parse_micro("1.8")) == "1.80"
+    assert format_money(parse_micro("0.005")) == "0.01"
+    assert format_money(3 * SCALE) == "3.00"
+
+
+def test_populate_row_updates_store_and_ppu(qtbot):
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+    dlg.name_edit.setText("Populated")
+
+    dlg.populate_row(0, name="gin", qty="50", unit="1", price="1.00")
+    assert dlg.table.cellWidget(0, dlg.COL_NAME).text() == "Gin"
+
+    ppu0 = dlg.table.cellWidget(0, dlg.COL_PRICE_PER_UNIT)
+    qtbot.waitUntil(lambda: ppu0.text() == "0.02", timeout=500)
+    assert dlg.ppu_sum_label.text().endswith("0.02")
+
+    recipe = dlg.get_recipe()
+    assert recipe.ingredients[0].name == "Gin"
+    assert recipe.ingredients[0].price_per_unit == Decimal("0.02")
+
+
+def test_rows_share_validators(qtbot):
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+    dlg.add_row()
+
+    qty0 = dlg.table.cellWidget(0, dlg.COL_QTY)
+    qty1 = dlg.table.cellWidget(1, dlg.COL_QTY)
+    assert qty0.validator() is qty1.validator()
+    assert qty0.validator() is dlg.table.cellWidget(1, dlg.COL_ROW_PRICE).validator()
+    assert dlg.table.cellWidget(0, dlg.COL_NAME).validator() is dlg.table.cellWidget(1, dlg.COL_NAME).validator()
+
+
+def test_add_row_applies_pending_recompute_before_copying_ppu(qtbot):
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+
+    dlg.table.cellWidget(0, dlg.COL_QTY).setText("700")
+    dlg.table.cellWidget(0, dlg.COL_UNIT).setText("25")
+    dlg.table.cellWidget(0, dlg.COL_ROW_PRICE).setText("18")
+    ppu0 = dlg.table.cellWidget(0, dlg.COL_PRICE_PER_UNIT)
+    qtbot.waitUntil(lambda: ppu0.text() == "0.64", timeout=500)
+
+    dlg.add_row()
+    # a row price without qty/spec queues a recompute that clears row 1's PPU
+    dlg.table.cellWidget(1, dlg.COL_ROW_PRICE).setText("5")
+    assert dlg._ppu_timer.isActive()
+    dlg.add_row()
+
+    ppus = [dlg.table.cellWidget(r, dlg.COL_PRICE_PER_UNIT).text() for r in range(3)]
+    assert ppus == ["0.64", "", ""]
+    qtbot.waitUntil(lambda: not dlg._update_pending, timeout=500)
+    assert dlg.ppu_sum_label.text().endswith("0.64")
+
+
+def test_populate_then_add_rows_within_debounce_window(qtbot):
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+
+    dlg.populate_row(0, qty="700", unit="25", price="18")
+    dlg._do_recompute_ppu()
+    dlg.add_row()
+    # clear row 1's copied PPU via a pending recompute, then add rows at once
+    dlg.populate_row(1, price="5")
+    assert dlg._ppu_timer.isActive()
+    dlg.add_rows([{}, {}])
+
+    ppus = [dlg.table.cellWidget(r, dlg.COL_PRICE_PER_UNIT).text() for r in range(4)]
+    assert ppus == ["0.64", "", "", ""]
+    assert dlg.ppu_sum_label.text().endswith("0.64")
+
+
+def test_add_rows_resets_pending_state_when_a_spec_fails(qtbot):
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+
+    with pytest.raises(TypeError):
+        dlg.add_rows([{"name": "Gin"}, {"bogus": "x"}])
+    assert not dlg._update_pending
+
+    # the sum label still follows PPU edits afterwards
+    dlg.table.cellWidget(1, dlg.COL_PRICE_PER_UNIT).setText("0.05")
+    assert dlg.ppu_sum_label.text().endswith("0.05")
+
+
+def test_invalid_row_price_clears_ppu(qtbot):
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+    dlg.name_edit.setText("Partial")
+
+    dlg.table.cellWidget(0, dlg.COL_NAME).setText("Gin")
+    dlg.table.cellWidget(0, dlg.COL_QTY).setText("700")
+    dlg.table.cellWidget(0, dlg.COL_UNIT).setText("25")
+    row_price0 = dlg.table.cellWidget(0, dlg.COL_ROW_PRICE)
+    row_price0.setText("18")
+    ppu0 = dlg.table.cellWidget(0, dlg.COL_PRICE_PER_UNIT)
+    qtbot.waitUntil(lambda: ppu0.text() == "0.64", timeout=500)
+
+    # "." is an intermediate state the validator lets the user type
+    row_price0.setText(".")
+    qtbot.waitUntil(lambda: ppu0.text() == "", timeout=500)
+    assert dlg.get_recipe().ingredients[0].price_per_unit == 0
+
+
+def test_calculate_keeps_invalid_row_price_text(qtbot):
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+    dlg.name_edit.setText("Partial")
+
+    dlg.populate_row(0, name="Gin", qty="50", unit="1", ppu="0.02")
+    row_price0 = dlg.table.cellWidget(0, dlg.COL_ROW_PRICE)
+    row_price0.setText(".")
+    dlg.on_calculate()
+    assert row_price0.text() == "."
+
+
+def test_add_rows_with_mistyped_spec_keeps_table_and_store_in_step(qtbot):
+    dlg = CocktailCostDialog()
+    qtbot.addWidget(dlg)
+
+    with pytest.raises(TypeError):
+        dlg.add_rows([{"name": "Gin"}, {"name": "Tonic", "qty": 50}])
+    assert dlg.table.rowCount() == len(dlg._rows) == len(dlg._row_widgets) == 2
+
+    # the dialog can still add rows afterwards
+    dlg.add_row()
+    assert dlg.table.rowCount() == len(dlg._rows) == 3
+    assert dlg.table.cellWidget(2, dlg.COL_NAME) is dlg._row_widgets[2][dlg.COL_NAME]
@@ -2,7 +2,7 @@ from decimal import Decimal
 
 import pytest
 
-from model import Ingredient, Recipe
+from model import Ingredient, IngredientTable, Recipe
 
 
 def test_ingredient_validation():
@@ -26,3 +26,52 @@ def test_recipe_validation_and_json_roundtrip(tmp_path):
     assert loaded.servings == r.servings
     assert len(loaded.ingredients) == 1
     assert loaded.ingredients[0].name == "A"
+
+
+def test_ingredient_table_iterates_as_ingredients():
+    ings = [
+        Ingredient(name="Gin", quantity=Decimal("50"), unit="ml", price_per_unit=Decimal("0.02")),
+        Ingredient(name="Tonic", quantity=Decimal("150"), unit="ml", price_per_unit=Decimal("0.001")),
+    ]
+    table = IngredientTable.from_ingredients(ings)
+    assert len(table) == 2
+    assert list(table.qty) == [50.0, 150.0]
+    rebuilt = list(table)
+    assert [i.name for i in rebuilt] == ["Gin", "Tonic"]
+    assert [i.quantity for i in rebuilt] == [Decimal("50"), Decimal("150")]
+    assert [i.price_per_unit for i in rebuilt] == [Decimal("0.02"), Decimal("0.001")]
+
+
+def test_json_roundtrip_without_orjson(tmp_path, monkeypatch):
+    import model
+
+    monkeypatch.setattr(model, "orjson", None)
+    ings = [Ingredient(name="Gin", quantity=Decimal("50"), unit="ml", price_per_unit=Decimal("0.02"))]
+    r = Recipe(name="G&T", ingredients=ings, servings=2)
+
+    p = tmp_path / "r.json"
+    r.save_to_json(str(p))
+    loaded = Recipe.load_from_json(str(p))
+    assert loaded.to_dict() == r.to_dict()
+
+
+def test_dataclasses_use_slots():
+    ing = Ingredient(name="Gin", quantity=50, unit="ml", price_per_unit=0.02)
+    assert not hasattr(ing, "__dict__")
+    with pytest.raises(AttributeError):
+        ing.note = "x"
+    assert not hasattr(Recipe(name="Test"), "__dict__")
+
+
+def test_ingredient_from_dict_accepts_mixed_numeric_types():
+    ing = Ingredient.from_dict({"name": "Gin", "quantity": Decimal("50"), "price_per_unit": "0.02"})
+    assert ing.quantity == Decimal("50") and ing.price_per_unit == Decimal("0.02")
+    ing = Ingredient.from_dict({"name": "Gin", "quantity": 50, "price_per_unit": 0.1})
+    assert ing.quantity == Decimal("50") and ing.price_per_unit == Decimal("0.1")
+
+
+def test_recipe_validate_rejects_non_ingredients():
+    ok = Ingredient(name="A", quantity=Decimal("1"), unit="u", price_per_unit=Decimal("0.5"))
+    for bad in (None, {"name": "B"}):
+        with pytest.raises(ValueError):
+            Recipe(name="R", ingredients=[ok, bad]).validate()